@@ -35,6 +35,8 @@ TESSERACT_PATH: Path = Path(get_env('TESSERACT_PATH',
 )
 POPPLER_PATH: Path = Path(get_env('POPPLER_PATH', 
                                 r'C:\Program Files\poppler-24.08.0\Library\bin'))
+# Only set when configured; otherwise tesserocr uses its built-in tessdata location
+TESSDATA_DIR: Optional[Path] = Path(get_env('TESSDATA_PREFIX')) if get_env('TESSDATA_PREFIX') else None
 
 # Default paths
 LOG_DIR: Path = ROOT_DIR / 'logs'
@@ -48,7 +50,12 @@ EXTRACTION_LOG_FILE: Path = LOG_DIR / 'extraction.log'
 LOG_DIR.mkdir(exist_ok=True, parents=True)
 
 # Translation settings
-BATCH_SIZE: int = int(get_env('BATCH_SIZE', '50'))  # Number of words per translation batch
+BATCH_SIZE: int = int(get_env('BATCH_SIZE', '20'))  # Number of words per translation request
+TRANSLATE_WORKERS: int = int(get_env('TRANSLATE_WORKERS', '8'))  # Threads shared by all batch translations
+
+# Text extraction settings
+EXTRACTION_WORKERS: int = int(get_env('EXTRACTION_WORKERS', str(os.cpu_count() or 1)))  # Worker processes for directory scans
+OCR_CONCURRENCY: int = int(get_env('OCR_CONCURRENCY', str(os.cpu_count() or 1)))  # Concurrent page OCRs per PDF (split between extraction workers)
 
 # API Keys (from environment variables)
 OPENROUTER_API_KEY: Optional[str] = get_env('OPENROUTER_API_KEY')
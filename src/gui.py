@@ -8,7 +8,7 @@ from src.config import DEFAULT_DB_PATH, DEFAULT_OUTPUT_FILE
 from src.text_extraction import extract_text_from_input
 from src.translator import RussianTranslator
 from src.anki_generator import create_anki_deck
-from src.storage import store_new_words, init_db_sqlite
+from src.storage import store_new_words, init_db_sqlite, get_vocab
 
 # Configure modern theme colors
 COLORS = {
@@ -595,13 +595,17 @@ class VocabExtractorGUI:
             step = 100.0 / total_steps
             current_progress = 0
             
+            # Read the vocabulary once and share it across all selected paths
+            existing_words = frozenset(get_vocab(self.storage_var.get(), self.db_path_var.get()))
+            
             # Collect words from all selected files
             all_words = set()
             for path in paths:
                 file_name = os.path.basename(path)
                 self.update_progress(current_progress, f"Processing: {file_name}")
                 
-                extracted_words = extract_text_from_input(path, self.storage_var.get(), self.db_path_var.get())
+                extracted_words = extract_text_from_input(path, self.storage_var.get(), self.db_path_var.get(),
+                                                          existing_words=existing_words)
                 all_words.update(word.lower() for word in extracted_words)
                 
                 current_progress += step
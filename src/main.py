@@ -37,7 +37,8 @@ class AppContext:
                 storage_type: str = 'sqlite', 
                 storage_path: Union[str, Path] = DEFAULT_DB_PATH,
                 output_file: Union[str, Path] = DEFAULT_OUTPUT_FILE,
-                log_level: int = logging.INFO):
+                log_level: int = logging.INFO,
+                force_console: bool = False):
         """
         Initialize application context.
         
@@ -46,6 +47,7 @@ class AppContext:
             storage_path: Path to the storage file
             output_file: Path to the output Anki deck file
             log_level: Logging level
+            force_console: Log to the console at log_level even when it is not a terminal
         """
         self.storage_type = storage_type
         self.storage_path = Path(storage_path)
@@ -54,7 +56,7 @@ class AppContext:
         self.translator = RussianTranslator()
         
         # Initialize logging
-        setup_logging(log_level, DEFAULT_LOG_FILE)
+        setup_logging(log_level, DEFAULT_LOG_FILE, force_console=force_console)
         
         # Validate configuration
         self.config_valid = validate_config()
@@ -93,11 +95,15 @@ def process_files(input_paths: List[Union[str, Path]],
     logger.info(f"Processing {len(input_paths)} input paths")
     
     try:
+        # Read the vocabulary once and share it across all input paths
+        existing_words = frozenset(get_vocab(app_context.storage_type, app_context.storage_path))
+        
         # Collect words from all files
         all_words = set()
         for path in input_paths:
             extracted_words = extract_text_from_input(
-                path, app_context.storage_type, app_context.storage_path
+                path, app_context.storage_type, app_context.storage_path,
+                existing_words=existing_words
             )
             all_words.update(word.lower() for word in extracted_words)
             
@@ -133,21 +139,25 @@ def process_files(input_paths: List[Union[str, Path]],
               help='Output file for Anki deck')
 @click.option('--log-level', type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']),
               default='INFO', help='Logging level')
+@click.option('--force-console', is_flag=True,
+              help='Log at the chosen level to the console even when output is redirected')
 @click.pass_context
-def cli(ctx: click.Context, storage: str, storage_path: str, output: str, log_level: str) -> None:
+def cli(ctx: click.Context, storage: str, storage_path: str, output: str, log_level: str,
+        force_console: bool) -> None:
     """Russian Vocabulary Extractor and Anki Deck Creator."""
     # Create application context
     ctx.obj = AppContext(
         storage_type=storage,
         storage_path=storage_path,
         output_file=output,
-        log_level=getattr(logging, log_level)
+        log_level=getattr(logging, log_level),
+        force_console=force_console
     )
     
     # Check dependencies
     deps = check_dependencies()
-    if not all(deps.values()):
-        logger.warning("Some dependencies are missing. Functionality may be limited.")
+    if deps.missing:
+        logger.warning(f"Missing dependencies: {', '.join(deps.missing)}. Functionality may be limited.")
 
 
 @cli.command()
@@ -184,33 +184,19 @@ class SQLiteStorage(BaseStorage):
         with self.get_connection() as conn:
             cursor = conn.cursor()
             try:
-                # Get existing words for duplicate check
-                cursor.execute("SELECT DISTINCT lower(word) FROM vocab")
-                existing = {row[0] for row in cursor.fetchall() if row[0] is not None}
-                
-                # Filter and add only truly new words
-                new_words_lower = {word.lower() for word in words}
-                truly_new_words = new_words_lower - existing
+                # Callers pass words already filtered against the vocabulary; the
+                # PRIMARY KEY constraint silently skips anything that slipped through
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO vocab (word, translation, context) VALUES (?, ?, ?)",
+                    ((word, "", "") for word in {word.lower() for word in words})
+                )
+                added_count = cursor.rowcount
+                conn.commit()
                 
-                if not truly_new_words:
+                if not added_count:
                     logger.info("All words already exist in the database.")
                     return 0
                 
-                # Add new words
-                added_count = 0
-                for word in truly_new_words:
-                    try:
-                        cursor.execute(
-                            "INSERT INTO vocab (word, translation, context) VALUES (?, ?, ?)",
-                            (word, "", "")
-                        )
-                        added_count += 1
-                    except sqlite3.IntegrityError:
-                        logger.warning(f"Word already exists (Integrity Error): {word}")
-                    except Exception as e:
-                        logger.error(f"Error inserting word {word}: {e}")
-                
-                conn.commit()
                 logger.info(f"Added {added_count} new words to SQLite {self.storage_path}")
                 return added_count
                 
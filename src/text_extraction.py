@@ -12,33 +12,59 @@ if not hasattr(inspect, 'getargspec'):
 
 import os
 import re
-import logging
-import docx
-from PIL import Image, ImageEnhance
+import queue
+import contextlib
+import zipfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Tesseract's OpenMP threading is slower than a single thread, and pages/files are
+# already OCR'd in parallel here; set before any Tesseract work (user value wins)
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+from lxml import etree
+from PIL import Image
 import pytesseract
 from pdfminer.high_level import extract_text as extract_text_pdfminer
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 import pymorphy2
 import unicodedata
 
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
 from src.storage import get_vocab
-from src.config import TESSERACT_PATH, POPPLER_PATH, EXTRACTION_LOG_FILE
+from src.utils import get_module_logger, flush_logs_at_worker_exit
+from src.config import (
+    TESSERACT_PATH, TESSDATA_DIR, POPPLER_PATH, EXTRACTION_LOG_FILE, EXTRACTION_WORKERS,
+    OCR_CONCURRENCY
+)
 
-# Configure extraction logger
-extraction_logger = logging.getLogger('Extraction')
-extraction_logger.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+# Extraction logger; its records are written by a background listener thread
+extraction_logger = get_module_logger('Extraction', EXTRACTION_LOG_FILE)
 
-# File handler for text extraction
-fh = logging.FileHandler(EXTRACTION_LOG_FILE, encoding='utf-8')
-fh.setFormatter(formatter)
-extraction_logger.addHandler(fh)
+# Combining stress marks that are kept as part of Russian words
+_STRESS_MARKS = '\u0301\u0300'
+
+# Runs of anything but Russian letters and stress marks; splitting on it cleans and
+# tokenizes a document in one C-level pass. ѐ/ѝ are what NFC makes of е/и with a grave accent.
+_SPLIT_RE = re.compile(r'[^а-яА-ЯёЁѐѝЀЍ' + _STRESS_MARKS + r']+')
 
 # Set Tesseract and Poppler paths
 pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH
 
-# Initialize PyMorphy2 morphological analyzer
-morph = pymorphy2.MorphAnalyzer()
+# PyMorphy2 morphological analyzer, created on first use (loading its dictionaries is expensive)
+morph = None
+
+def _get_morph():
+    """Return the shared PyMorphy2 analyzer, creating it on first use."""
+    global morph
+    if morph is None:
+        morph = pymorphy2.MorphAnalyzer()
+    return morph
 
 def is_valid_russian_word(word):
     """
@@ -47,95 +73,325 @@ def is_valid_russian_word(word):
     (e.g. stress marks) are properly combined with the base letters.
     """
     normalized_word = unicodedata.normalize('NFC', word)
-    parses = morph.parse(normalized_word)
+    parses = _get_morph().parse(normalized_word)
     # A word is considered valid if any parse does not have the 'UNKN' flag.
     for p in parses:
         if 'UNKN' not in p.tag:
             return True
     return False
 
-def clean_and_split_text(text):
-    """Cleans text and extracts Russian words."""
+def clean_and_split_text(text, min_len=1, require_morph=True):
+    """
+    Cleans text and extracts Russian words.
+
+    Words shorter than min_len are dropped. If require_morph is set, only words
+    that PyMorphy2 recognizes (see is_valid_russian_word) are returned.
+    """
     if not text:
         return set()
     
-    # Remove all non-Russian characters except spaces and combining diacritics (stresses)
-    cleaned = re.sub(r'[^а-яА-ЯёЁ\s\u0301\u0300]', ' ', text)
-    
-    # Normalize spaces
-    cleaned = ' '.join(cleaned.split())
+    # Collapse composed/decomposed variants (e.g. ё vs е + U+0308) before splitting
+    text = unicodedata.normalize('NFC', text)
     
-    # Split into words and filter based on Russian letters.
-    words = set()
-    for word in cleaned.split():
-        if len(word) >= 1 and re.search(r'[а-яА-ЯёЁ\u0301\u0300]+', word):
-            words.add(word.lower())
+    # Split on everything except Russian letters and combining diacritics (stresses);
+    # every token is Cyrillic by construction, so only drop stray stress marks
+    words = {
+        word.lower() for word in _SPLIT_RE.split(text)
+        if len(word) >= min_len and word.strip(_STRESS_MARKS)
+    }
     
     extraction_logger.debug(f"Extracted {len(words)} potential Russian words")
+    if require_morph:
+        words = {word for word in words if is_valid_russian_word(word)}
     return words
 
+# WordprocessingML elements read by extract_text_from_docx
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_TEXT = _W_NS + 't'
+_W_PARAGRAPH = _W_NS + 'p'
+
+# Run content that separates words without a w:t (tab, line break, carriage return)
+_W_WHITESPACE = {_W_NS + 'tab': '\t', _W_NS + 'br': '\n', _W_NS + 'cr': '\n'}
+
 def extract_text_from_docx(filepath):
-    """Extract text from a .docx file."""
+    """
+    Extract text from a .docx file, one line per paragraph.
+
+    word/document.xml is streamed with lxml iterparse; every element is cleared
+    once read and finished paragraphs are detached from the tree, so memory
+    stays flat regardless of document size.
+    """
     extraction_logger.info(f"Starting DOCX extraction: {filepath}")
     try:
-        doc = docx.Document(filepath)
-        text = '\n'.join(paragraph.text for paragraph in doc.paragraphs)
+        paragraphs = []
+        runs = []
+        with zipfile.ZipFile(filepath) as archive, archive.open('word/document.xml') as document:
+            for _, elem in etree.iterparse(document, tag=(_W_TEXT, _W_PARAGRAPH, *_W_WHITESPACE)):
+                if elem.tag == _W_TEXT:
+                    if elem.text:
+                        runs.append(elem.text)
+                elif elem.tag in _W_WHITESPACE:
+                    runs.append(_W_WHITESPACE[elem.tag])
+                else:
+                    paragraphs.append(''.join(runs))
+                    runs.clear()
+                    # Cleared elements stay attached to their parent; drop the processed
+                    # siblings (earlier paragraphs, tables, ...) so the tree does not grow
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+                    continue
+                elem.clear()
+        text = '\n'.join(paragraphs)
         extraction_logger.info(f"Text successfully extracted from DOCX: {filepath}")
         return text
     except Exception as e:
         extraction_logger.error(f"Error during DOCX extraction from {filepath}: {str(e)}")
         return ""
 
+# Images with a known resolution below _MIN_OCR_DPI are upscaled to _TARGET_OCR_DPI before OCR,
+# but only if they are actually small: photos and screenshots often claim a nominal 72 dpi.
+# Upscaling never goes past _MAX_OCR_PIXELS (about an A4 page at 300 dpi).
+_MIN_OCR_DPI = 150
+_TARGET_OCR_DPI = 300
+_MAX_OCR_PIXELS = 9_000_000
+
+# Our images are already binarized dark-on-light, so Tesseract's inverted retry pass is skipped
+_TESSERACT_CONFIG = '-c tessedit_do_invert=0'
+
+# Idle tesserocr API handles of this process. PyTessBaseAPI is not thread-safe, so each
+# handle is borrowed by one thread at a time and returned for reuse by later pages/files.
+_tess_apis = queue.SimpleQueue()
+
+# Cleared when tesserocr cannot load the Russian model (e.g. a wrong tessdata path);
+# OCR then goes through pytesseract for the rest of the process
+_tesserocr_usable = tesserocr is not None
+
+def _create_tess_api():
+    """Create a tesserocr API handle with the Russian model loaded, or None if that fails."""
+    global _tesserocr_usable
+    kwargs = {'path': str(TESSDATA_DIR)} if TESSDATA_DIR else {}
+    try:
+        api = tesserocr.PyTessBaseAPI(lang='rus', **kwargs)
+    except RuntimeError as e:
+        _tesserocr_usable = False
+        extraction_logger.warning(f"tesserocr unavailable, falling back to pytesseract: {str(e)}")
+        return None
+    api.SetVariable('tessedit_do_invert', '0')
+    return api
+
+@contextlib.contextmanager
+def _borrow_tess_api():
+    """Borrow an idle tesserocr API handle, creating one if all are in use (None if that fails)."""
+    try:
+        api = _tess_apis.get_nowait()
+    except queue.Empty:
+        api = _create_tess_api()
+    try:
+        yield api
+    finally:
+        if api is not None:
+            _tess_apis.put(api)
+
+def _otsu_threshold(histogram):
+    """Return the Otsu threshold (maximum between-class variance) of a 256-bin histogram."""
+    total = sum(histogram)
+    sum_all = sum(value * count for value, count in enumerate(histogram))
+    sum_background = weight_background = 0
+    best_threshold, best_variance = 0, 0.0
+    for threshold, count in enumerate(histogram):
+        weight_background += count
+        if not weight_background:
+            continue
+        weight_foreground = total - weight_background
+        if not weight_foreground:
+            break
+        sum_background += threshold * count
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_all - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_threshold, best_variance = threshold, variance
+    return best_threshold
+
+def _preprocess_for_ocr(image):
+    """Convert an image to a binarized (Otsu) grayscale image at a resolution suited to Tesseract."""
+    dpi = image.info.get('dpi', (0, 0))[0]
+    image = image.convert('L')
+    
+    # Upscale low-resolution scans; Tesseract works best at roughly 300 dpi
+    pixels = image.width * image.height
+    if dpi and dpi < _MIN_OCR_DPI and pixels < _MAX_OCR_PIXELS:
+        scale = min(_TARGET_OCR_DPI / dpi, (_MAX_OCR_PIXELS / pixels) ** 0.5)
+        image = image.resize((round(image.width * scale), round(image.height * scale)), Image.BICUBIC)
+    
+    # Global Otsu binarization through a lookup table, evaluated in C by PIL
+    threshold = _otsu_threshold(image.histogram())
+    return image.point([0] * (threshold + 1) + [255] * (255 - threshold))
+
+def _ocr_pil_image(image):
+    """
+    Run Tesseract on an already loaded PIL image with improved preprocessing.
+
+    If tesserocr is installed, the Russian model stays loaded in API handles
+    that are reused for every image and page of the process; otherwise
+    pytesseract starts a tesseract process per image.
+    """
+    image = _preprocess_for_ocr(image)
+    
+    # Extract text using Tesseract (Russian language)
+    if _tesserocr_usable:
+        with _borrow_tess_api() as api:
+            if api is not None:
+                api.SetImage(image)
+                return api.GetUTF8Text()
+    return pytesseract.image_to_string(image, lang='rus', config=_TESSERACT_CONFIG)
+
 def extract_text_from_image(image_path):
-    """Extract text from an image with improved preprocessing."""
+    """
+    Extract text from an image with improved preprocessing.
+
+    Tesseract runs single-threaded (OMP_THREAD_LIMIT=1 unless set by the user):
+    a lone large image may OCR somewhat slower, but the page and file level
+    parallelism avoids OpenMP contention between concurrent Tesseract runs.
+    """
     extraction_logger.info(f"Starting OCR for: {image_path}")
     try:
         pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH
-        
-        # Open the image
-        image = Image.open(image_path)
-        
-        # Convert to grayscale and enhance contrast for better OCR performance
-        image = image.convert('L')
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(2.0)
-        
-        # Extract text using Tesseract (Russian language)
-        text = pytesseract.image_to_string(image, lang='rus')
+        text = _ocr_pil_image(Image.open(image_path))
         extraction_logger.info(f"Text extracted from image: {image_path}")
         return text
     except Exception as e:
         extraction_logger.error(f"Error during OCR of {image_path}: {str(e)}")
         return ""
 
+# Concurrent page OCRs per PDF; lowered by _init_worker so that extraction worker
+# processes together stay within the CPU count
+_ocr_concurrency = OCR_CONCURRENCY
+
+# Maximum number of rendered pages waiting for OCR
+_PAGE_QUEUE_SIZE = 4
+
+# pdfminer pages with less stripped text than this are treated as scanned and OCR'd
+_MIN_PAGE_TEXT = 50
+
+def _render_pdf_pages(pdf_path, page_indices, page_queue, worker_count):
+    """PDF OCR pipeline stage 1: render pages one at a time in memory and queue (index, image)."""
+    try:
+        for index in page_indices:
+            # A page Poppler cannot render is skipped; the pages after it are still OCR'd
+            try:
+                images = convert_from_path(
+                    pdf_path, poppler_path=POPPLER_PATH, first_page=index + 1, last_page=index + 1
+                )
+            except Exception as e:
+                extraction_logger.error(f"Error rendering page {index + 1} of {pdf_path}: {str(e)}")
+                continue
+            page_queue.put((index, images[0]))
+    finally:
+        # One stop marker per OCR worker
+        for _ in range(worker_count):
+            page_queue.put(None)
+
+def _ocr_pdf_pages(page_queue, text_queue):
+    """PDF OCR pipeline stage 2: OCR queued page images and pass (index, text) on."""
+    while True:
+        item = page_queue.get()
+        if item is None:
+            text_queue.put(None)
+            return
+        index, image = item
+        try:
+            text_queue.put((index, _ocr_pil_image(image)))
+        except Exception as e:
+            # Failed pages are left out of the results rather than reported as empty
+            extraction_logger.error(f"Error during OCR of page {index + 1}: {str(e)}")
+
+def _ocr_pdf(pdf_path, page_indices):
+    """
+    OCR the given 0-based pages of a PDF and return a dict of page index to text.
+    Pages that could not be rendered or OCR'd are missing from the dict.
+
+    Rendering, OCR and collection run as a pipeline connected by bounded queues,
+    so Poppler renders the next page while Tesseract is still busy with the
+    previous ones. Rendered pages are handed to Tesseract in memory, without
+    a temporary image file.
+    """
+    worker_count = max(1, min(len(page_indices), _ocr_concurrency))
+    page_queue = queue.Queue(maxsize=_PAGE_QUEUE_SIZE)
+    text_queue = queue.Queue()
+    
+    threads = [threading.Thread(
+        target=_render_pdf_pages,
+        args=(pdf_path, page_indices, page_queue, worker_count),
+        daemon=True
+    )]
+    threads.extend(
+        threading.Thread(target=_ocr_pdf_pages, args=(page_queue, text_queue), daemon=True)
+        for _ in range(worker_count)
+    )
+    for thread in threads:
+        thread.start()
+    
+    # Stage 3: collect page texts until every OCR worker has finished
+    page_texts = {}
+    finished_workers = 0
+    while finished_workers < worker_count:
+        item = text_queue.get()
+        if item is None:
+            finished_workers += 1
+        else:
+            index, page_text = item
+            page_texts[index] = page_text
+    
+    for thread in threads:
+        thread.join()
+    
+    return page_texts
+
 def extract_text_from_pdf_ocr(pdf_path):
-    """Extract text from a PDF using OCR."""
+    """Extract text from a PDF using OCR on every page."""
     extraction_logger.info(f"Starting PDF OCR for: {pdf_path}")
     try:
-        # Convert PDF pages to images using Poppler
-        pages = convert_from_path(pdf_path, poppler_path=POPPLER_PATH)
-        text = ""
-        for i, page in enumerate(pages):
-            temp_image = f"temp_page_{i}.png"
-            page.save(temp_image, 'PNG')
-            page_text = extract_text_from_image(temp_image)
-            text += page_text + "\n"
-            os.remove(temp_image)
-        return text
+        page_count = pdfinfo_from_path(pdf_path, poppler_path=POPPLER_PATH)["Pages"]
+        page_texts = _ocr_pdf(pdf_path, range(page_count))
+        return "".join(page_texts.get(index, "") + "\n" for index in range(page_count))
     except Exception as e:
         extraction_logger.error(f"Error during PDF OCR of {pdf_path}: {str(e)}")
         return ""
 
 def extract_text_from_pdf(filepath):
-    """Extract text from a PDF using both pdfminer and OCR if needed."""
+    """
+    Extract text from a PDF using pdfminer, falling back to OCR per page.
+
+    Only pages whose embedded text is (nearly) empty are rendered and OCR'd,
+    so digital pages in a mixed PDF never go through Tesseract. A page keeps
+    its embedded text unless OCR finds more.
+    """
     extraction_logger.info(f"Starting PDF extraction: {filepath}")
     try:
         text = extract_text_pdfminer(filepath)
         extraction_logger.debug(f"PDFMiner extraction: {len(text)} characters")
-        if len(text.strip()) < 100:
-            extraction_logger.info("Little text found, trying OCR...")
-            text = extract_text_from_pdf_ocr(filepath)
-        return text
+        
+        # pdfminer terminates every page (including empty ones) with a form feed
+        page_texts = text.split('\f')
+        if text.endswith('\f'):
+            page_texts.pop()
+        
+        scanned_pages = [
+            index for index, page_text in enumerate(page_texts)
+            if len(page_text.strip()) < _MIN_PAGE_TEXT
+        ]
+        if scanned_pages:
+            extraction_logger.info(
+                f"Little text found on {len(scanned_pages)} of {len(page_texts)} pages, trying OCR..."
+            )
+            # Short pages can be digital too (titles, last pages): keep pdfminer's text
+            # unless OCR found more
+            for index, ocr_text in _ocr_pdf(filepath, scanned_pages).items():
+                if len(ocr_text.strip()) > len(page_texts[index].strip()):
+                    page_texts[index] = ocr_text
+        return "\n".join(page_texts)
     except Exception as e:
         extraction_logger.error(f"Error processing PDF {filepath}: {str(e)}")
         return ""
@@ -182,55 +438,99 @@ def extract_text_from_file(filepath):
         extraction_logger.error(f"Error extracting text from {filepath}: {str(e)}")
         return ""
 
-def extract_text_from_input(input_path, storage='sqlite', storage_path='vocab.db'):
+# Existing vocabulary, broadcast once to each extraction worker process by _init_worker
+_EXISTING_WORDS = frozenset()
+_REQUIRE_MORPH = True
+
+def _init_worker(existing_words, require_morph, ocr_concurrency):
+    """
+    Process pool initializer: receive the existing vocabulary and this worker's share
+    of the OCR concurrency once per worker process and, with tesserocr, load the
+    Russian OCR model up front.
+    """
+    global _EXISTING_WORDS, _REQUIRE_MORPH, _ocr_concurrency
+    _EXISTING_WORDS = existing_words
+    _REQUIRE_MORPH = require_morph
+    _ocr_concurrency = ocr_concurrency
+    flush_logs_at_worker_exit()
+    if _tesserocr_usable:
+        api = _create_tess_api()
+        if api is not None:
+            _tess_apis.put(api)
+
+def _process_file(file_path, existing_words, require_morph=True):
+    """Extract the valid words of one file and the subset not yet in existing_words."""
+    text = extract_text_from_file(file_path)
+    valid_words = clean_and_split_text(text, require_morph=require_morph)
+    # Words are lowercased by clean_and_split_text, so a plain set difference suffices
+    new_words = valid_words - existing_words
+    return valid_words, new_words
+
+def _extract_new_words(file_path):
+    """Worker task: _process_file against the vocabulary received by _init_worker."""
+    return _process_file(file_path, _EXISTING_WORDS, _REQUIRE_MORPH)
+
+def extract_text_from_input(input_path, storage='sqlite', storage_path='vocab.db', require_morph=True,
+                            existing_words=None):
     """
     Extracts text from a file or directory based on file type.
     Supports PDF, DOCX, Markdown (.md), plain text, and image files.
-    Additionally, it checks each extracted word with PyMorphy2 (after normalization)
-    to ensure that the word is a genuine Russian word.
+    Unless require_morph is disabled, it checks each extracted word with PyMorphy2
+    (after normalization) to ensure that the word is a genuine Russian word.
+    Callers processing several inputs can pass the vocabulary as existing_words
+    so that the storage is only read once.
     """
     extraction_logger.info(f"Starting text extraction from: {input_path}")
     try:
         # Get existing words from the database at the beginning
-        existing_words = get_vocab(storage, storage_path)
+        if existing_words is None:
+            existing_words = get_vocab(storage, storage_path)
+        existing_words = frozenset(existing_words)
         extraction_logger.info(f"{len(existing_words)} existing words found in {storage} {storage_path}.")
         
         if not os.path.exists(input_path):
             extraction_logger.error(f"File not found: {input_path}")
             return set()
 
-        # If it's a directory, process all supported files
+        # If it's a directory, process all supported files in worker processes
         if os.path.isdir(input_path):
+            file_paths = [
+                os.path.join(root, file)
+                for root, dirs, files in os.walk(input_path)
+                for file in files
+                if os.path.splitext(file)[1].lower() in [".txt", ".pdf", ".docx", ".png", ".jpg", ".jpeg", ".md"]
+            ]
             new_words = set()
             total_valid_words = set()
-            for root, dirs, files in os.walk(input_path):
-                for file in files:
-                    ext = os.path.splitext(file)[1].lower()
-                    if ext in [".txt", ".pdf", ".docx", ".png", ".jpg", ".jpeg", ".md"]:
-                        file_path = os.path.join(root, file)
-                        text = extract_text_from_file(file_path)
-                        words = clean_and_split_text(text)
-                        # Validate each word with PyMorphy2 (with normalization)
-                        valid_words = {word for word in words if is_valid_russian_word(word)}
-                        total_valid_words.update(valid_words)
-                        new_words_from_file = {word for word in valid_words if word.lower() not in existing_words}
-                        if new_words_from_file:
-                            new_words.update(new_words_from_file)
-                            extraction_logger.info(
-                                f"File {file}: {len(valid_words)} valid words found, {len(new_words_from_file)} new"
-                            )
+            # Split the CPUs between the worker processes, so that N workers OCR'ing
+            # PDFs don't each run OCR_CONCURRENCY Tesseracts at once
+            worker_count = max(1, min(EXTRACTION_WORKERS, len(file_paths)))
+            ocr_concurrency = min(OCR_CONCURRENCY, max(1, (os.cpu_count() or 1) // worker_count))
+            # The vocabulary is pickled once per worker via the initializer, not once per file.
+            # Workers are spawned (as on Windows) rather than forked: a forked worker would
+            # inherit the log QueueHandlers without the listener threads draining them
+            with ProcessPoolExecutor(max_workers=worker_count,
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker,
+                                     initargs=(existing_words, require_morph, ocr_concurrency)) as executor:
+                results = executor.map(_extract_new_words, file_paths)
+                for file_path, (valid_words, new_words_from_file) in zip(file_paths, results):
+                    total_valid_words.update(valid_words)
+                    if new_words_from_file:
+                        new_words.update(new_words_from_file)
+                        extraction_logger.info(
+                            f"File {os.path.basename(file_path)}: {len(valid_words)} valid words found, "
+                            f"{len(new_words_from_file)} new"
+                        )
             extraction_logger.info(
                 f"Directory total: {len(total_valid_words)} valid words found, {len(new_words)} new"
             )
             return new_words
 
         # If it's a single file, extract and validate its content.
-        text = extract_text_from_file(input_path)
-        words = clean_and_split_text(text)
-        valid_words = {word for word in words if is_valid_russian_word(word)}
-        new_words = {word for word in valid_words if word.lower() not in existing_words}
+        valid_words, new_words = _process_file(input_path, existing_words, require_morph)
         extraction_logger.info(
-            f"File total: {len(valid_words)} valid words out of {len(words)} total found, {len(new_words)} new"
+            f"File total: {len(valid_words)} valid words found, {len(new_words)} new"
         )
         return new_words
             
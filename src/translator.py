@@ -6,23 +6,65 @@ with support for multiple translation providers and caching.
 """
 import re
 import os
-import json
+import sys
 import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import sqlite3
+import atexit
+import threading
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, TypedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-from functools import wraps
+from functools import cache, wraps
 
-from src.config import TRANSLATION_LOG_FILE, ROOT_DIR
-from src.utils import TranslationError
+from src.config import TRANSLATION_LOG_FILE, ROOT_DIR, TRANSLATE_WORKERS, BATCH_SIZE
+from src.utils import TranslationError, RetriesExhaustedError, ConfigurationError, get_module_logger
 
-# Logger for this module
-logger = logging.getLogger(__name__)
+# Logger for this module; its records are written by a background listener thread
+logger = get_module_logger(__name__, TRANSLATION_LOG_FILE)
+
+# Whether .env has been loaded into the environment (see _load_env)
+_ENV_LOADED = False
+
+def _load_env() -> None:
+    """Load environment variables from .env once per process."""
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    load_dotenv()
+    _ENV_LOADED = True
+    if not os.getenv('OPENROUTER_API_KEY'):
+        logger.warning("OPENROUTER_API_KEY not found in environment variables")
+
+# Pattern used by is_russian_word, compiled once at import
+_RUSSIAN_RE = re.compile(r'[А-Яа-я]')
+
+def _contains_russian(word: str) -> bool:
+    """
+    Check if a word contains a Russian letter.
+    
+    Words from text extraction are Cyrillic-only, so a Russian first letter answers
+    almost every call without running the regex.
+    
+    Args:
+        word: The word to check
+        
+    Returns:
+        True if the word contains a Russian letter, False otherwise
+    """
+    if not word:
+        return False
+    return 'А' <= word[0] <= 'я' or bool(_RUSSIAN_RE.search(word))
+
+# Outermost {...} of a model reply, i.e. the JSON object without code fences or chatter
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
 
 # Cache directory
 CACHE_DIR = ROOT_DIR / 'cache'
@@ -32,6 +74,34 @@ CACHE_DB = CACHE_DIR / 'translation_cache.db'
 CACHE_DIR.mkdir(exist_ok=True, parents=True)
 
 
+# Worker threads shared by every batch_translate call, so threads (and the keep-alive
+# connections of the provider sessions) survive from one batch to the next
+_EXECUTOR = ThreadPoolExecutor(max_workers=TRANSLATE_WORKERS, thread_name_prefix='translator')
+atexit.register(_EXECUTOR.shutdown)
+
+class _CappedRetry(Retry):
+    """urllib3 Retry that never waits longer than MAX_RETRY_AFTER for a Retry-After header."""
+    
+    MAX_RETRY_AFTER = 30.0
+    
+    def get_retry_after(self, response: Any) -> Optional[float]:
+        """
+        Get the server's requested wait, capped at MAX_RETRY_AFTER seconds.
+        
+        Args:
+            response: The HTTP response carrying the Retry-After header
+            
+        Returns:
+            The wait in seconds, or None if the response has no Retry-After header
+        """
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.MAX_RETRY_AFTER)
+
+# Status codes retried by the provider sessions' HTTP adapter
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
 class TranslationResult(TypedDict, total=False):
     """Type definition for translation results."""
     original: str
@@ -43,7 +113,7 @@ class TranslationResult(TypedDict, total=False):
 
 
 def retry_with_backoff(max_retries: int = 3, initial_backoff: float = 1.0, 
-                      backoff_factor: float = 2.0):
+                      backoff_factor: float = 2.0, give_up_on: tuple = ()):
     """
     Decorator for retrying functions with exponential backoff.
     
@@ -51,6 +121,7 @@ def retry_with_backoff(max_retries: int = 3, initial_backoff: float = 1.0,
         max_retries: Maximum number of retries
         initial_backoff: Initial backoff time in seconds
         backoff_factor: Factor to increase backoff time with each retry
+        give_up_on: Exception types that are raised immediately instead of retried
     """
     def decorator(func):
         @wraps(func)
@@ -61,6 +132,8 @@ def retry_with_backoff(max_retries: int = 3, initial_backoff: float = 1.0,
             while retries < max_retries:
                 try:
                     return func(*args, **kwargs)
+                except give_up_on:
+                    raise
                 except Exception as e:
                     retries += 1
                     if retries >= max_retries:
@@ -81,35 +154,81 @@ def retry_with_backoff(max_retries: int = 3, initial_backoff: float = 1.0,
 class TranslationCache:
     """Cache for translation results to avoid redundant API calls."""
     
+    # Maximum number of bound parameters per IN (...) query (SQLite's historic limit is 999)
+    _MAX_QUERY_PARAMS = 500
+    
     def __init__(self, db_path: Union[str, Path] = CACHE_DB):
         """
         Initialize the translation cache.
         
+        A single long-lived connection in WAL mode is shared by all threads;
+        access to it is serialized with a lock.
+        
         Args:
             db_path: Path to the SQLite database file for caching
         """
         self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
         self._init_db()
     
     def _init_db(self) -> None:
         """Initialize the cache database."""
-        conn = sqlite3.connect(self.db_path)
+        with self._lock:
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                cursor.execute("PRAGMA mmap_size=268435456")
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS translations (
+                        word TEXT,
+                        provider TEXT,
+                        result TEXT,
+                        timestamp INTEGER,
+                        PRIMARY KEY (word, provider)
+                    )
+                """)
+                self._migrate_primary_key(cursor)
+                logger.debug(f"Translation cache initialized at {self.db_path}")
+            except Exception as e:
+                logger.error(f"Error initializing translation cache: {e}")
+    
+    @staticmethod
+    def _migrate_primary_key(cursor: sqlite3.Cursor) -> None:
+        """
+        Re-key a cache created with word as the only primary key on (word, provider),
+        so that results of different providers/strategies no longer replace each other.
+        
+        Args:
+            cursor: Cursor on the cache connection
+        """
+        primary_key = [row[1] for row in cursor.execute("PRAGMA table_info(translations)") if row[5]]
+        if primary_key != ['word']:
+            return
+        cursor.execute("BEGIN")
         try:
-            cursor = conn.cursor()
+            cursor.execute("ALTER TABLE translations RENAME TO translations_old")
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS translations (
-                    word TEXT PRIMARY KEY,
+                CREATE TABLE translations (
+                    word TEXT,
                     provider TEXT,
                     result TEXT,
-                    timestamp INTEGER
+                    timestamp INTEGER,
+                    PRIMARY KEY (word, provider)
                 )
             """)
-            conn.commit()
-            logger.debug(f"Translation cache initialized at {self.db_path}")
-        except Exception as e:
-            logger.error(f"Error initializing translation cache: {e}")
-        finally:
-            conn.close()
+            cursor.execute("""
+                INSERT INTO translations (word, provider, result, timestamp)
+                SELECT word, provider, result, timestamp FROM translations_old
+            """)
+            cursor.execute("DROP TABLE translations_old")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        logger.info("Migrated translation cache to a (word, provider) primary key")
     
     def get(self, word: str, provider: str) -> Optional[Dict[str, Any]]:
         """
@@ -122,24 +241,39 @@ class TranslationCache:
         Returns:
             Cached translation result or None if not found
         """
-        conn = sqlite3.connect(self.db_path)
+        result = self.get_many([word], provider).get(word.lower())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Cache %s for '%s' using provider '%s'", "hit" if result else "miss", word, provider)
+        return result
+    
+    def get_many(self, words: List[str], provider: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get cached translation results for several words at once.
+        
+        Args:
+            words: The words to look up
+            provider: The translation provider
+            
+        Returns:
+            Cached translation results keyed by lowercased word; misses are omitted
+        """
+        keys = list({word.lower() for word in words})
+        results = {}
         try:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT result FROM translations WHERE word = ? AND provider = ?",
-                (word.lower(), provider)
-            )
-            row = cursor.fetchone()
-            if row:
-                logger.debug(f"Cache hit for '{word}' using provider '{provider}'")
-                return json.loads(row[0])
-            logger.debug(f"Cache miss for '{word}' using provider '{provider}'")
-            return None
+            with self._lock:
+                cursor = self.conn.cursor()
+                for i in range(0, len(keys), self._MAX_QUERY_PARAMS):
+                    chunk = keys[i:i + self._MAX_QUERY_PARAMS]
+                    cursor.execute(
+                        f"SELECT word, result FROM translations "
+                        f"WHERE provider = ? AND word IN ({','.join('?' * len(chunk))})",
+                        (provider, *chunk)
+                    )
+                    for word, result in cursor.fetchall():
+                        results[word] = orjson.loads(result)
         except Exception as e:
             logger.error(f"Error retrieving from cache: {e}")
-            return None
-        finally:
-            conn.close()
+        return results
     
     def set(self, word: str, provider: str, result: Dict[str, Any]) -> None:
         """
@@ -150,23 +284,42 @@ class TranslationCache:
             provider: The translation provider
             result: The translation result
         """
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO translations (word, provider, result, timestamp)
-                VALUES (?, ?, ?, ?)
-                """,
-                (word.lower(), provider, json.dumps(result), int(time.time()))
-            )
-            conn.commit()
-            logger.debug(f"Cached translation for '{word}' using provider '{provider}'")
-        except Exception as e:
-            logger.error(f"Error storing in cache: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
+        self.set_many({word: result}, provider)
+        logger.debug("Cached translation for '%s' using provider '%s'", word, provider)
+    
+    def set_many(self, items: Dict[str, Dict[str, Any]], provider: str) -> None:
+        """
+        Store several translation results in the cache in one transaction.
+        
+        Args:
+            items: Translation results keyed by word
+            provider: The translation provider
+        """
+        if not items:
+            return
+        timestamp = int(time.time())
+        with self._lock:
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute("BEGIN")
+                cursor.executemany(
+                    """
+                    INSERT OR REPLACE INTO translations (word, provider, result, timestamp)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    [(word.lower(), provider, orjson.dumps(result).decode(), timestamp)
+                     for word, result in items.items()]
+                )
+                cursor.execute("COMMIT")
+            except Exception as e:
+                logger.error(f"Error storing in cache: {e}")
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+    
+    def close(self) -> None:
+        """Close the cache database connection."""
+        with self._lock:
+            self.conn.close()
 
 
 class TranslationProvider(ABC):
@@ -190,37 +343,147 @@ class TranslationProvider(ABC):
             Translation result or None if translation failed
         """
         pass
+    
+    def translate_batch(self, words: List[str]) -> Dict[str, TranslationResult]:
+        """
+        Translate several words from Russian to German.
+        
+        Providers that can translate many words per request should override this;
+        the default translates word by word.
+        
+        Args:
+            words: The Russian words to translate
+            
+        Returns:
+            Translation results keyed by word; words that failed are omitted
+        """
+        results = {}
+        for word in words:
+            result = self.translate(word)
+            if result:
+                results[word] = result
+        return results
+
+
+@dataclass(frozen=True)
+class PromptSpec:
+    """Model and prompts used to translate words; only the words are appended per request."""
+    model: str
+    word_prompt_head: str
+    batch_prompt_head: str
+    
+    def build(self, word: str) -> str:
+        """
+        Build the prompt translating a single word.
+        
+        Args:
+            word: The Russian word to translate
+            
+        Returns:
+            The complete prompt
+        """
+        return self.word_prompt_head + word
+    
+    def build_batch(self, words: List[str]) -> str:
+        """
+        Build the prompt translating several words at once.
+        
+        Args:
+            words: The Russian words to translate
+            
+        Returns:
+            The complete prompt
+        """
+        return self.batch_prompt_head + ", ".join(words)
+
+
+# Available translation strategies, selected by name in RussianTranslator
+TRANSLATION_STRATEGIES: Dict[str, PromptSpec] = {
+    "de": PromptSpec(
+        model="google/gemini-2.0-flash-lite-001an",
+        word_prompt_head=(
+            "You are a professional Russian-to-German translator. Translate the given Russian word into German. "
+            "When providing Russian examples use stresses over the characters which indicate the stress position of the word.\n"
+            "You MUST respond ONLY with a valid JSON object in the following format, and nothing else. "
+            "Do not include any extra text or explanations before or after the JSON. Ensure the JSON is well-formed. "
+            "The JSON object should be enclosed in code block delimiters (triple backticks) and should not contain any other formatting.\n"
+            "Example JSON Response:\n"
+            '{"translation": "dein", "part_of_speech": "Possessivpronomen", '
+            '"grammatical_case": "Nominativ, Genitiv, Dativ, Akkusativ (abhängig von Fall, Geschlecht und Numerus des Bezugswortes)", '
+            '"example_ru": "Э́то твой кот.", "example_de": "Das ist deine Katze."}\n'
+            "Russian word: "
+        ),
+        batch_prompt_head=(
+            "You are a professional Russian-to-German translator. Translate each of the given Russian words into German. "
+            "When providing Russian examples use stresses over the characters which indicate the stress position of the word.\n"
+            "You MUST respond ONLY with a valid JSON object that maps every given Russian word to an object in the following format, and nothing else. "
+            "Do not include any extra text or explanations before or after the JSON. Ensure the JSON is well-formed.\n"
+            "Example JSON Response:\n"
+            '{"твой": {"translation": "dein", "part_of_speech": "Possessivpronomen", '
+            '"grammatical_case": "Nominativ, Genitiv, Dativ, Akkusativ (abhängig von Fall, Geschlecht und Numerus des Bezugswortes)", '
+            '"example_ru": "Э́то твой кот.", "example_de": "Das ist deine Katze."}}\n'
+            "Russian words: "
+        ),
+    ),
+}
+
+DEFAULT_STRATEGY = "de"
 
 
 class OpenRouterTranslationProvider(TranslationProvider):
     """Translation provider using OpenRouter API."""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "google/gemini-2.0-flash-lite-001an"):
+    # Request headers shared by all instances; only the Authorization header is per key
+    _BASE_HEADERS = {
+        "HTTP-Referer": "https://github.com/OpenRouterTeam/openrouter",
+        "X-Title": "Russian-Anki-Translator",
+    }
+    
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None,
+                 pool_size: int = 10, strategy: str = DEFAULT_STRATEGY):
         """
         Initialize the OpenRouter translation provider.
         
         Args:
             api_key: OpenRouter API key (defaults to environment variable)
-            model: Model to use for translation
+            model: Model to use for translation (defaults to the strategy's model)
+            pool_size: Number of keep-alive connections to hold (match the number of workers)
+            strategy: Name of the prompt strategy in TRANSLATION_STRATEGIES
         """
+        if strategy not in TRANSLATION_STRATEGIES:
+            raise ConfigurationError(f"Unknown translation strategy: {strategy}")
+        self.strategy = strategy
+        self._spec = TRANSLATION_STRATEGIES[strategy]
+        _load_env()
         self.api_key = api_key or os.getenv('OPENROUTER_API_KEY')
         if not self.api_key:
             raise TranslationError("OpenRouter API Key not found. Please check .env file.")
         
-        self.model = model
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "HTTP-Referer": "https://github.com/OpenRouterTeam/openrouter",
-            "X-Title": "Russian-Anki-Translator",
-        }
-        logger.info(f"OpenRouter translation provider initialized with model {model}")
+        self.model = model or self._spec.model
+        self.headers = {**self._BASE_HEADERS, "Authorization": f"Bearer {self.api_key}"}
+        
+        # Shared session so consecutive requests reuse TCP/TLS connections; it carries
+        # the headers and retries transient failures (rate limits, gateway errors) at the
+        # connection level. On 429 the wait follows the server's Retry-After header (capped)
+        # instead of the exponential backoff. Read timeouts are not retried here: the
+        # request may already have been processed (and billed) by the API
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retries = _CappedRetry(total=5, read=False, backoff_factor=0.5, status_forcelist=_RETRY_STATUSES,
+                               allowed_methods=frozenset({"POST"}), respect_retry_after_header=True,
+                               raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        self.session.mount("https://", adapter)
+        logger.info(f"OpenRouter translation provider initialized with model {self.model}")
     
     @property
     def name(self) -> str:
-        """Get the name of the translation provider."""
-        return "openrouter"
+        """Get the name of the translation provider (cached results are stored under it)."""
+        if self.strategy == DEFAULT_STRATEGY:
+            return "openrouter"
+        return f"openrouter-{self.strategy}"
     
-    @retry_with_backoff(max_retries=3, initial_backoff=2.0)
+    @retry_with_backoff(max_retries=3, initial_backoff=2.0, give_up_on=(RetriesExhaustedError,))
     def translate(self, word: str) -> Optional[TranslationResult]:
         """
         Translate a word from Russian to German using OpenRouter API.
@@ -233,24 +496,62 @@ class OpenRouterTranslationProvider(TranslationProvider):
         """
         logger.info(f"Translating '{word}' using OpenRouter")
         
-        # Updated prompt instructing a strict JSON response
-        prompt = (
-            "You are a professional Russian-to-German translator. Translate the given Russian word into German. "
-            "When providing Russian examples use stresses over the characters which indicate the stress position of the word.\n"
-            "You MUST respond ONLY with a valid JSON object in the following format, and nothing else. "
-            "Do not include any extra text or explanations before or after the JSON. Ensure the JSON is well-formed. "
-            "The JSON object should be enclosed in code block delimiters (triple backticks) and should not contain any other formatting.\n"
-            "Example JSON Response:\n"
-            '{"translation": "dein", "part_of_speech": "Possessivpronomen", '
-            '"grammatical_case": "Nominativ, Genitiv, Dativ, Akkusativ (abhängig von Fall, Geschlecht und Numerus des Bezugswortes)", '
-            '"example_ru": "Э́то твой кот.", "example_de": "Das ist deine Katze."}\n'
-            f"Russian word: {word}"
-        )
+        prompt = self._spec.build(word)
+        
+        content = self._complete(prompt, f"'{word}'")
+        return self._parse_response(content, word)
+    
+    @retry_with_backoff(max_retries=3, initial_backoff=2.0, give_up_on=(RetriesExhaustedError,))
+    def translate_batch(self, words: List[str]) -> Dict[str, TranslationResult]:
+        """
+        Translate several Russian words to German with a single OpenRouter request.
         
+        Args:
+            words: The Russian words to translate
+            
+        Returns:
+            Translation results keyed by word; words missing from the response
+            (or all words, if the response is not valid JSON) are omitted
+        """
+        logger.info(f"Translating {len(words)} words using OpenRouter")
+        
+        prompt = self._spec.build_batch(words)
+        
+        content = self._complete(prompt, f"{len(words)} words")
+        data = self._load_json_object(content)
+        if data is None:
+            logger.error(f"Failed to parse batch JSON response: {content}")
+            return {}
+        
+        # Models occasionally change the case of the keys
+        entries = {str(key).strip().lower(): value for key, value in data.items()}
+        results = {}
+        for word in words:
+            entry = entries.get(word.lower())
+            if isinstance(entry, dict):
+                results[word] = self._normalize_result(entry, word)
+        logger.info(f"Batch translation returned {len(results)}/{len(words)} words")
+        return results
+    
+    def _complete(self, prompt: str, subject: str) -> str:
+        """
+        Send a prompt to the OpenRouter chat completions endpoint.
+        
+        Args:
+            prompt: The system prompt to send
+            subject: Description of what is being translated, for error messages
+            
+        Returns:
+            The content of the model's reply
+            
+        Raises:
+            RetriesExhaustedError: If the API still rate limits or fails after the
+                session's retries
+            TranslationError: If the request fails or the API returns an error
+        """
         try:
-            response = requests.post(
+            response = self.session.post(
                 "https://openrouter.ai/api/v1/chat/completions",
-                headers=self.headers,
                 json={
                     "model": self.model,
                     "messages": [
@@ -260,22 +561,72 @@ class OpenRouterTranslationProvider(TranslationProvider):
                         }
                     ]
                 },
-                timeout=30  # Add timeout to prevent hanging requests
+                timeout=(3.05, 30)  # Fail fast on connect, allow slow model replies
             )
             
             if response.status_code == 200:
-                content = response.json()["choices"][0]["message"]["content"].strip()
-                return self._parse_response(content, word)
+                # Parse the raw body with orjson rather than response.json()
+                return orjson.loads(response.content)["choices"][0]["message"]["content"].strip()
             else:
                 error_msg = f"API Error: {response.status_code} - {response.text}"
                 logger.error(error_msg)
+                if response.status_code in _RETRY_STATUSES:
+                    raise RetriesExhaustedError(error_msg)
                 raise TranslationError(error_msg)
                 
         except requests.RequestException as e:
-            error_msg = f"Request error translating '{word}': {str(e)}"
+            error_msg = f"Request error translating {subject}: {str(e)}"
+            logger.error(error_msg)
+            raise TranslationError(error_msg) from e
+        except (orjson.JSONDecodeError, ValueError) as e:
+            error_msg = f"Invalid API response translating {subject}: {str(e)}"
             logger.error(error_msg)
             raise TranslationError(error_msg) from e
     
+    @staticmethod
+    def _load_json_object(content: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse the JSON object contained in a model reply.
+        
+        Args:
+            content: The reply, possibly wrapped in code fences or extra text
+            
+        Returns:
+            The parsed object, or None if no valid JSON object was found
+        """
+        # Most replies are plain JSON; only cut the object out of the reply if that fails
+        try:
+            data = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            match = _JSON_RE.search(content)
+            if match is None:
+                return None
+            try:
+                data = orjson.loads(match.group())
+            except orjson.JSONDecodeError:
+                return None
+        return data if isinstance(data, dict) else None
+    
+    @staticmethod
+    def _normalize_result(translation_data: Dict[str, Any], word: str) -> TranslationResult:
+        """
+        Attach the original word and normalize key names of a parsed translation.
+        
+        Args:
+            translation_data: The parsed translation object
+            word: The original word
+            
+        Returns:
+            The normalized translation result
+        """
+        # Ensure the returned data includes the original word
+        translation_data["original"] = word
+        
+        # Normalize keys (some models might return grammatical_case instead of grammatical case)
+        if "grammatical_case" in translation_data and "grammatical case" not in translation_data:
+            translation_data["grammatical case"] = translation_data.pop("grammatical_case")
+        return translation_data
+    
     def _parse_response(self, content: str, word: str) -> TranslationResult:
         """
         Parse the API response to extract translation data.
@@ -287,79 +638,57 @@ class OpenRouterTranslationProvider(TranslationProvider):
         Returns:
             Parsed translation result
         """
-        # Remove any leading characters before the JSON
-        content = content[content.find('{'):]
-
-        # Check if the response is encapsulated in a code block
-        if content.startswith("```json"):
-            content = content[7:].strip()
-        elif content.startswith("```"):
-            content = content[3:].strip()
-        if content.endswith("```"):
-            content = content[:-3].strip()
-
-        # Try to parse the response as JSON
-        try:
-            translation_data = json.loads(content)
-            # Ensure the returned data includes the original word
-            translation_data["original"] = word
-            
-            # Normalize keys (some models might return grammatical_case instead of grammatical case)
-            if "grammatical_case" in translation_data and "grammatical case" not in translation_data:
-                translation_data["grammatical case"] = translation_data.pop("grammatical_case")
-                
+        data = self._load_json_object(content)
+        if data is not None:
+            translation_data = self._normalize_result(data, word)
             logger.info(f"Translation successful: {translation_data}")
             return translation_data
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse JSON directly from response: {content}")
-
-            # Fallback: try to extract JSON-like text using boundaries
-            start = content.find('{')
-            end = content.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = content[start:end]
-                try:
-                    translation_data = json.loads(json_str)
-                    translation_data["original"] = word
-                    logger.info(f"Fallback JSON parsing successful: {translation_data}")
-                    return translation_data
-                except json.JSONDecodeError as e:
-                    logger.error(f"Fallback JSON parsing failed: {str(e)}")
-            
-            # Final fallback: return raw text in a dictionary
-            fallback = {
-                "translation": content, 
-                "part_of_speech": "", 
-                "grammatical case": "", 
-                "example_ru": "", 
-                "example_de": "", 
-                "original": word
-            }
-            logger.info("Returning fallback translation data as raw text.")
-            return fallback
+        logger.error(f"Failed to parse JSON from response: {content}")
+        
+        # Final fallback: return raw text in a dictionary
+        fallback = {
+            "translation": content, 
+            "part_of_speech": "", 
+            "grammatical case": "", 
+            "example_ru": "", 
+            "example_de": "", 
+            "original": word
+        }
+        logger.info("Returning fallback translation data as raw text.")
+        return fallback
 
 
 class RussianTranslator:
     """Main translator class with support for multiple providers and caching."""
     
-    def __init__(self, use_cache: bool = True):
+    def __init__(self, use_cache: bool = True, max_workers: int = 5, strategy: str = DEFAULT_STRATEGY):
         """
         Initialize the Russian translator.
         
         Args:
             use_cache: Whether to use translation caching
+            max_workers: Default number of parallel workers for batch_translate
+            strategy: Name of the prompt strategy in TRANSLATION_STRATEGIES
         """
+        self.max_workers = max_workers
+        
         # Load environment variables
-        load_dotenv()
+        _load_env()
         
         # Initialize cache
         self.use_cache = use_cache
         if use_cache:
             self.cache = TranslationCache()
         
+        # In-memory results of this translator, keyed by cleaned word; saves the
+        # SQLite lookup (or API call, without the cache) for repeated words
+        self._memo: Dict[str, TranslationResult] = {}
+        self._memo_lock = threading.Lock()
+        
         # Initialize providers (default to OpenRouter)
         self.providers: List[TranslationProvider] = [
-            OpenRouterTranslationProvider()
+            # One keep-alive connection per shared worker thread, plus one for the calling thread
+            OpenRouterTranslationProvider(pool_size=TRANSLATE_WORKERS + 1, strategy=strategy)
         ]
         
         logger.info(f"RussianTranslator initialized with {len(self.providers)} providers")
@@ -374,9 +703,9 @@ class RussianTranslator:
         Returns:
             True if the word contains Russian characters, False otherwise
         """
-        russian_pattern = re.compile(r'[А-Яа-я]')
-        is_russian = bool(russian_pattern.search(word))
-        logger.debug(f"Word check: '{word}' is{'' if is_russian else ' not'} Russian")
+        is_russian = _contains_russian(word)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Word check: '%s' is%s Russian", word, '' if is_russian else ' not')
         return is_russian
     
     def clean_word(self, word: str) -> str:
@@ -389,10 +718,9 @@ class RussianTranslator:
         Returns:
             Cleaned word
         """
-        original = word
         cleaned = word.strip().lower()
-        if original != cleaned:
-            logger.debug(f"Word cleaned: '{original}' -> '{cleaned}'")
+        if cleaned != word and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Word cleaned: '%s' -> '%s'", word, cleaned)
         return cleaned
     
     def translate_word(self, word: str) -> Optional[TranslationResult]:
@@ -410,15 +738,40 @@ class RussianTranslator:
             return None
             
         word = self.clean_word(word)
+        result = self._memo.get(word)
+        if result is None:
+            result = self._translate_uncached(word)
+            if result:
+                self._remember({word: result})
+        return result
+    
+    def _remember(self, results: Dict[str, TranslationResult]) -> None:
+        """
+        Store translation results in the in-memory cache.
+        
+        Args:
+            results: Translation results keyed by cleaned word
+        """
+        with self._memo_lock:
+            self._memo.update(results)
+    
+    def _translate_uncached(self, word: str) -> Optional[TranslationResult]:
+        """
+        Translate a cleaned word without consulting the in-memory cache.
+        
+        Args:
+            word: The cleaned Russian word
+            
+        Returns:
+            Translation result or None if translation failed
+        """
         logger.info(f"Translating word: {word}")
         
         # Check cache first if enabled
-        if self.use_cache:
-            for provider in self.providers:
-                cached_result = self.cache.get(word, provider.name)
-                if cached_result:
-                    logger.info(f"Using cached translation for '{word}'")
-                    return cached_result
+        cached_result = self._get_cached(word)
+        if cached_result:
+            logger.info(f"Using cached translation for '{word}'")
+            return cached_result
         
         # Try each provider in order
         for provider in self.providers:
@@ -436,86 +789,187 @@ class RussianTranslator:
         logger.error(f"All translation providers failed for '{word}'")
         return None
     
-    def batch_translate(self, words: List[str], batch_size: int = 10, max_workers: int = 5) -> List[TranslationResult]:
+    def _get_cached(self, word: str) -> Optional[TranslationResult]:
+        """
+        Look up a cleaned word in the translation cache of any provider.
+        
+        Args:
+            word: The cleaned Russian word
+            
+        Returns:
+            Cached translation result or None if not cached (or caching is disabled)
+        """
+        if self.use_cache:
+            for provider in self.providers:
+                cached_result = self.cache.get(word, provider.name)
+                if cached_result:
+                    return cached_result
+        return None
+    
+    def _translate_chunk(self, words: List[str]) -> Dict[str, TranslationResult]:
+        """
+        Translate a chunk of cleaned, uncached words with one request per provider.
+        
+        Words the provider's batch response does not cover are translated one by one,
+        unless the batch request was given up on after the HTTP-level retries.
+        
+        Args:
+            words: The cleaned Russian words to translate
+            
+        Returns:
+            Translation results keyed by word; words that failed are omitted
+        """
+        results: Dict[str, TranslationResult] = {}
+        retries_exhausted = False
+        for provider in self.providers:
+            try:
+                results = provider.translate_batch(words)
+            except RetriesExhaustedError as e:
+                logger.error(f"Provider {provider.name} gave up on batch of {len(words)} words: {str(e)}")
+                retries_exhausted = True
+                continue
+            except Exception as e:
+                logger.error(f"Provider {provider.name} failed to translate batch of {len(words)} words: {str(e)}")
+                continue
+            if self.use_cache:
+                self.cache.set_many(results, provider.name)
+            self._remember(results)
+            break
+        
+        # Still rate limited (or the API is down): one request per word would only make it worse
+        if retries_exhausted and not results:
+            return {}
+        
+        translations = dict(results)
+        for word in words:
+            if word not in results:
+                translation = self.translate_word(word)
+                if translation:
+                    translations[word] = translation
+        return translations
+    
+    def batch_translate(self, words: List[str], batch_size: Optional[int] = None,
+                        max_workers: Optional[int] = None) -> List[TranslationResult]:
         """
         Translate a list of words in parallel.
         
         Args:
             words: List of words to translate
-            batch_size: Number of words per batch
-            max_workers: Maximum number of parallel workers
+            batch_size: Number of words per API request (defaults to BATCH_SIZE from config)
+            max_workers: Maximum number of chunks in flight at once (defaults to self.max_workers);
+                the chunks run on the shared module-level thread pool
             
         Returns:
-            List of translation results
+            List of translation results, in the order the words were first given
         """
         if not words:
             return []
+        batch_size = batch_size or BATCH_SIZE
+        max_workers = max_workers or self.max_workers
             
-        # Deduplicate the words
-        unique_words = list(set(words))
+        # Clean, then deduplicate in input order, so variants such as " Привет" and "привет"
+        # collapse into one word and repeated runs request words in the same order
+        unique_words = list(dict.fromkeys(self.clean_word(word) for word in words if word))
         logger.info(f"Starting parallel batch translation of {len(unique_words)} unique words with {max_workers} workers")
-        translations = []
         
-        # Process words in batches in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Create a list of futures for the translations
-            futures = {executor.submit(self.translate_word, word): word for word in unique_words}
-            
-            # Collect the results
-            for future in as_completed(futures):
-                word = futures[future]
-                try:
-                    translation = future.result()
-                    if translation:
-                        translations.append(translation)
-                except Exception as e:
-                    logger.error(f"Error translating '{word}': {str(e)}")
-                    
+        cleaned_words = []
+        for word in unique_words:
+            if not self.is_russian_word(word):
+                logger.warning(f"Skipping translation for non-Russian or empty word: {word}")
+                continue
+            cleaned_words.append(word)
+        
+        # One slot per word, filled in place as results arrive, so the output keeps input order
+        index = {word: i for i, word in enumerate(cleaned_words)}
+        translations: List[Optional[TranslationResult]] = [None] * len(cleaned_words)
+        
+        # Serve words translated earlier by this translator, then cached words (one bulk
+        # lookup per provider); only the rest is sent
+        pending = []
+        for i, word in enumerate(cleaned_words):
+            result = self._memo.get(word)
+            if result is None:
+                pending.append(word)
+            else:
+                translations[i] = result
+        if self.use_cache:
+            for provider in self.providers:
+                cached = self.cache.get_many(pending, provider.name)
+                for word, result in cached.items():
+                    translations[index[word]] = result
+                self._remember(cached)
+                pending = [word for word in pending if word not in cached]
+        logger.info(f"{len(cleaned_words) - len(pending)} words served from cache, {len(pending)} to translate")
+        
+        # Translate the remaining words in chunks of batch_size, one request per chunk
+        chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        in_flight = threading.BoundedSemaphore(max_workers)
+        futures = {}
+        for chunk in chunks:
+            in_flight.acquire()
+            future = _EXECUTOR.submit(self._translate_chunk, chunk)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures[future] = chunk
+        
+        # Collect the results
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                for word, result in future.result().items():
+                    translations[index[word]] = result
+            except Exception as e:
+                logger.error(f"Error translating batch {chunk}: {str(e)}")
+        
+        translations = [translation for translation in translations if translation]
         logger.info(f"Parallel batch translation completed. {len(translations)}/{len(unique_words)} translations created.")
         return translations
 
 
 # Example usage:
 if __name__ == "__main__":
-    # Configure logging for standalone execution
-    log_handler = logging.FileHandler(TRANSLATION_LOG_FILE, encoding='utf-8')
-    log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    logger.addHandler(log_handler)
-    logger.setLevel(logging.INFO)
-    
     # Test the translator
     logger.info("Starting translator test")
     translator = RussianTranslator()
     
-    test_words = ["привет", "книга", "test", "здравствуйте"]
+    # Intentionally repeated words: each distinct word is translated once and the
+    # results are fanned back out to every occurrence
+    test_words = ["привет", "книга", "привет", "test", "книга", "здравствуйте"]
     logger.info(f"Testing with words: {test_words}")
     
-    print("Testing translations:")
+    unique_words = list(dict.fromkeys(test_words))
+    lookup = {t["original"]: t for t in translator.batch_translate(unique_words, max_workers=2)}
+    
+    # Collect the report and write it in one go rather than one print per line
+    parts = ["Testing translations:\n"]
     for word in test_words:
-        result = translator.translate_word(word)
+        result = lookup.get(translator.clean_word(word))
         if result:
-            print(f"\nOriginal: {word}")
-            print(f"Translation: {result['translation']}")
+            parts.append(f"\nOriginal: {word}\nTranslation: {result['translation']}\n")
         else:
-            print(f"\nError translating '{word}'")
+            parts.append(f"\nError translating '{word}'\n")
+    
+    # Cyrillic output must not fail on consoles with a legacy default encoding
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+    sys.stdout.write("".join(parts))
     
     logger.info("Translator test completed")
 
-# Configure module logger when imported
-if not logger.handlers:
-    log_handler = logging.FileHandler(TRANSLATION_LOG_FILE, encoding='utf-8')
-    log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    logger.addHandler(log_handler)
-    logger.setLevel(logging.INFO)
-
-# Load environment variables when imported
-load_dotenv()
-
-# Create cache directory when imported
-CACHE_DIR.mkdir(exist_ok=True, parents=True)
+@cache
+def _get_default_translator() -> RussianTranslator:
+    """
+    Return the shared translator behind the module-level functions, creating it on first use.
+    
+    Returns:
+        The default RussianTranslator instance
+    """
+    return RussianTranslator()
 
-# Initialize default translator instance for module-level access
-default_translator = RussianTranslator()
+def __getattr__(name: str) -> Any:
+    """Create the default translator lazily when ``default_translator`` is first accessed."""
+    if name == 'default_translator':
+        return _get_default_translator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def translate_word(word: str) -> Optional[TranslationResult]:
     """
@@ -527,21 +981,21 @@ def translate_word(word: str) -> Optional[TranslationResult]:
     Returns:
         Translation result or None if translation failed
     """
-    return default_translator.translate_word(word)
+    return _get_default_translator().translate_word(word)
 
-def batch_translate(words: List[str], batch_size: int = 10, max_workers: int = 5) -> List[TranslationResult]:
+def batch_translate(words: List[str], batch_size: Optional[int] = None, max_workers: int = 5) -> List[TranslationResult]:
     """
     Module-level function to translate a list of words in parallel.
     
     Args:
         words: List of words to translate
-        batch_size: Number of words per batch
+        batch_size: Number of words per API request (defaults to BATCH_SIZE from config)
         max_workers: Maximum number of parallel workers
         
     Returns:
         List of translation results
     """
-    return default_translator.batch_translate(words, batch_size, max_workers)
+    return _get_default_translator().batch_translate(words, batch_size, max_workers)
 
 def is_russian_word(word: str) -> bool:
     """
@@ -553,7 +1007,7 @@ def is_russian_word(word: str) -> bool:
     Returns:
         True if the word contains Russian characters, False otherwise
     """
-    return default_translator.is_russian_word(word)
+    return _contains_russian(word)
 
 def clean_word(word: str) -> str:
     """
@@ -565,7 +1019,7 @@ def clean_word(word: str) -> str:
     Returns:
         Cleaned word
     """
-    return default_translator.clean_word(word)
+    return word.strip().lower()
 
 # Backward compatibility
 RussianTranslator.translate = RussianTranslator.translate_word
@@ -573,33 +1027,10 @@ RussianTranslator.translate = RussianTranslator.translate_word
 # Cleanup translation_logger references for backward compatibility
 translation_logger = logger
 
-# Ensure cache directory exists
-if not CACHE_DIR.exists():
-    CACHE_DIR.mkdir(parents=True)
-
-# Initialize cache database
-if not CACHE_DB.exists():
-    TranslationCache()._init_db()
-
-# Load environment variables
-if not os.getenv('OPENROUTER_API_KEY'):
-    load_dotenv()
-    if not os.getenv('OPENROUTER_API_KEY'):
-        logger.warning("OPENROUTER_API_KEY not found in environment variables")
-
-# Ensure backward compatibility
-try:
-    # Create a default translator instance
-    default_translator = RussianTranslator()
-except Exception as e:
-    logger.error(f"Error initializing default translator: {str(e)}")
-    default_translator = None
-
 def translate_word_compat(word):
     """Backward compatibility function for translate_word."""
-    if default_translator:
-        try:
-            return default_translator.translate_word(word)
-        except Exception as e:
-            logger.error(f"Error in translate_word_compat: {str(e)}")
+    try:
+        return _get_default_translator().translate_word(word)
+    except Exception as e:
+        logger.error(f"Error in translate_word_compat: {str(e)}")
     return None
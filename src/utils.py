@@ -5,14 +5,23 @@ This module centralizes logging configuration, provides error handling utilities
 and includes functions to check external dependencies.
 """
 import os
-import logging
 import sys
-from typing import Optional, Dict, Any, Callable
+import time
+import queue
+import atexit
+import logging
+import threading
+import functools
+import multiprocessing.util
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from dataclasses import dataclass, fields
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, Callable, Dict, List, Tuple
 
-from src.config import (
-    TESSERACT_PATH, POPPLER_PATH, DEFAULT_LOG_FILE, 
-    TRANSLATION_LOG_FILE, EXTRACTION_LOG_FILE
-)
+from src.config import TESSERACT_PATH, POPPLER_PATH, DEFAULT_LOG_FILE
+
+# Logger for this module
+logger = logging.getLogger(__name__)
 
 # Custom exception classes
 class RussianAnkiError(Exception):
@@ -27,6 +36,10 @@ class TranslationError(RussianAnkiError):
     """Exception raised for errors during translation operations."""
     pass
 
+class RetriesExhaustedError(TranslationError):
+    """Exception raised when an API request still fails after the HTTP-level retries."""
+    pass
+
 class ExtractionError(RussianAnkiError):
     """Exception raised for errors during text extraction operations."""
     pass
@@ -39,52 +52,312 @@ class AnkiGenerationError(RussianAnkiError):
     """Exception raised for errors during Anki deck generation."""
     pass
 
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders the date and time of %(asctime)s only once per second;
+    records within the same second reuse that string and only add their milliseconds.
+    """
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None):
+        super().__init__(fmt, datefmt)
+        # (second, datefmt, rendered time), replaced as a whole so threads never see a mix
+        self._cached_time = (None, None, '')
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        cached_second, cached_datefmt, rendered = self._cached_time
+        if second != cached_second or datefmt != cached_datefmt:
+            rendered = time.strftime(datefmt or self.default_time_format, self.converter(record.created))
+            self._cached_time = (second, datefmt, rendered)
+        if datefmt:
+            return rendered
+        return self.default_msec_format % (rendered, record.msecs)
+
+# Formatter shared by the root logger and the per-module log files
+LOG_FORMATTER = _CachedTimeFormatter('%(asctime)s - %(levelname)s - %(message)s')
+
+# Formatter of the loggers created by get_module_logger, which also show the logger name
+_MODULE_FORMATTER = _CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# Log records are only enqueued by the logging threads; QueueListener threads own the
+# real console/file handlers and do the writing in the background
+_ACTIVE_LISTENERS: List[QueueListener] = []
+
+# Listener behind the root logger's QueueHandler (see setup_logging)
+_root_listener: Optional[QueueListener] = None
+_root_handler: Optional[QueueHandler] = None
+
+# Listeners behind module loggers, keyed by (absolute log file path or None, interactive console)
+_MODULE_LISTENERS: Dict[Tuple[Optional[str], bool], QueueListener] = {}
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    Log file with a 64 KiB write buffer. Records handed over together with
+    handle_batch() reach the disk with a single flush instead of one per record.
+    """
+    def __init__(self, filename: str):
+        super().__init__(filename, mode="a", encoding="utf-8")
+        self._defer_flush = False
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def flush(self) -> None:
+        # emit() flushes after every record; within a batch only the last flush happens
+        if not self._defer_flush:
+            super().flush()
+    
+    def handle_batch(self, records: List[logging.LogRecord]) -> None:
+        """
+        Handle several records and flush the file once at the end.
+        
+        Args:
+            records: The records to write, in order
+        """
+        self.acquire()
+        try:
+            self._defer_flush = True
+            try:
+                for record in records:
+                    self.handle(record)
+            finally:
+                self._defer_flush = False
+            self.flush()
+        finally:
+            self.release()
+
+class _FileBuffer(MemoryHandler):
+    """
+    Buffer records for a file handler and write them in batches of up to 512 records,
+    or immediately for errors. Closing flushes the buffer and closes the file.
+    """
+    def __init__(self, target: _BufferedFileHandler):
+        super().__init__(capacity=512, flushLevel=logging.ERROR, target=target, flushOnClose=True)
+    
+    def flush(self) -> None:
+        # Nothing buffered: skip taking the handler lock
+        if not self.buffer:
+            return
+        self.acquire()
+        try:
+            if self.target:
+                self.target.handle_batch(self.buffer)
+                self.buffer.clear()
+        finally:
+            self.release()
+    
+    def close(self) -> None:
+        target = self.target
+        super().close()
+        if target is not None:
+            target.close()
+
+# Log directories already created by _ensure_dir
+_ENSURED_DIRS: set = set()
+
+def _ensure_dir(path: str) -> None:
+    """
+    Create the parent directory of a file once per process.
+    
+    Args:
+        path: Path to the file whose directory should exist
+    """
+    directory = os.path.dirname(path)
+    if directory and directory not in _ENSURED_DIRS:
+        os.makedirs(directory, exist_ok=True)
+        _ENSURED_DIRS.add(directory)
+
+def _is_tty(stream: Any) -> bool:
+    """
+    Check whether a stream is an interactive terminal.
+    
+    Args:
+        stream: The stream to check (may be None, e.g. under pythonw)
+        
+    Returns:
+        True if the stream is attached to a terminal
+    """
+    try:
+        return stream is not None and stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+def _console_level(stream: Any, log_level: int, force_console: bool) -> int:
+    """
+    Get the level for console output: only warnings and errors unless the console
+    stream is a terminal (or console output is forced).
+    
+    Args:
+        stream: The console stream
+        log_level: The level requested for interactive use
+        force_console: Use log_level even when the stream is not a terminal
+        
+    Returns:
+        The level for the console handler
+    """
+    if force_console or _is_tty(stream):
+        return log_level
+    return max(log_level, logging.WARNING)
+
+def _console_handler(stream: Any, log_level: int, force_console: bool,
+                     formatter: logging.Formatter) -> Optional[logging.Handler]:
+    """
+    Create a console handler. When the stream is not a terminal (output redirected
+    or daemonized), only warnings and errors are written, to stderr, so routine
+    records skip formatting and a pipe write per line but failures stay visible.
+    
+    Args:
+        stream: The console stream for interactive use
+        log_level: The level for interactive use
+        force_console: Write to stream at log_level even when it is not a terminal
+        formatter: The formatter for the handler
+        
+    Returns:
+        The handler, or None if there is no console at all (e.g. under pythonw)
+    """
+    if not (force_console or _is_tty(stream)):
+        stream, log_level = sys.stderr, max(log_level, logging.WARNING)
+    if stream is None:
+        return None
+    ch = logging.StreamHandler(stream)
+    ch.setLevel(log_level)
+    ch.setFormatter(formatter)
+    return ch
+
+def _start_listener(*handlers: logging.Handler) -> QueueListener:
+    """
+    Start a background listener writing queued records to the given handlers.
+    
+    Args:
+        *handlers: The handlers that do the actual output
+        
+    Returns:
+        The started listener; attach a QueueHandler(listener.queue) to feed it
+    """
+    listener = QueueListener(queue.SimpleQueue(), *handlers, respect_handler_level=True)
+    listener.start()
+    _ACTIVE_LISTENERS.append(listener)
+    return listener
+
+def _stop_listener(listener: QueueListener) -> None:
+    """
+    Stop a listener after it has written all queued records, and close its handlers.
+    
+    Args:
+        listener: A listener started by _start_listener
+    """
+    if listener not in _ACTIVE_LISTENERS:
+        return
+    _ACTIVE_LISTENERS.remove(listener)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+@atexit.register
+def _stop_all_listeners() -> None:
+    """Flush and stop all logging listeners at interpreter exit."""
+    for listener in list(_ACTIVE_LISTENERS):
+        _stop_listener(listener)
+
+def flush_logs_at_worker_exit() -> None:
+    """
+    Flush and stop the logging listeners when this multiprocessing worker exits.
+    
+    atexit handlers do not run in multiprocessing worker processes, so call this
+    from a pool initializer to keep buffered records from being lost.
+    """
+    multiprocessing.util.Finalize(None, _stop_all_listeners, exitpriority=0)
+
 # Centralized logging configuration
-def setup_logging(log_level: int = logging.INFO, log_file: str = DEFAULT_LOG_FILE) -> logging.Logger:
+def setup_logging(log_level: int = logging.INFO, log_file: str = DEFAULT_LOG_FILE,
+                  force_console: bool = False) -> logging.Logger:
     """
-    Configure logging to both file and console.
+    Configure logging to file and console. Unless stderr is a terminal, only
+    warnings and errors are written to the console.
     
     Args:
         log_level: The logging level to use (default: logging.INFO)
         log_file: Path to the log file (default: DEFAULT_LOG_FILE)
+        force_console: Log to the console at log_level even when stderr is not a terminal
         
     Returns:
         The configured root logger
     """
-    # Clear existing handlers to avoid duplicates
+    global _root_listener, _root_handler
     logger = logging.getLogger()
+    logger.setLevel(log_level)
+    
+    # Already logging to this file: only apply the new level
+    log_file = os.path.abspath(log_file)
+    if (_root_handler in logger.handlers and
+            any(getattr(getattr(h, 'target', None), 'baseFilename', None) == log_file
+                for h in _root_listener.handlers)):
+        for handler in _root_listener.handlers:
+            if isinstance(handler, _FileBuffer):
+                handler.setLevel(log_level)
+            else:
+                handler.setLevel(_console_level(sys.stderr, log_level, force_console))
+        return logger
+    
+    # Clear (and close) existing handlers to avoid duplicates
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
-        
-    logger.setLevel(log_level)
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-
-    # Console Handler
-    ch = logging.StreamHandler()
-    ch.setLevel(log_level)
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
+        handler.close()
+    if _root_listener is not None:
+        _stop_listener(_root_listener)
 
     # File Handler
-    os.makedirs(os.path.dirname(log_file), exist_ok=True)
-    fh = logging.FileHandler(log_file, encoding="utf-8", mode="a")
-    fh.setLevel(log_level)
-    fh.setFormatter(formatter)
-    logger.addHandler(fh)
+    _ensure_dir(log_file)
+    fh = _BufferedFileHandler(log_file)
+    fh.setFormatter(LOG_FORMATTER)
+    file_buffer = _FileBuffer(fh)
+    file_buffer.setLevel(log_level)
+    
+    handlers: List[logging.Handler] = [file_buffer]
+    
+    # Console Handler
+    ch = _console_handler(sys.stderr, log_level, force_console, LOG_FORMATTER)
+    if ch is not None:
+        handlers.append(ch)
+    
+    _root_listener = _start_listener(*handlers)
+    _root_handler = QueueHandler(_root_listener.queue)
+    logger.addHandler(_root_handler)
     
     return logger
 
-def get_module_logger(name: str, log_file: Optional[str] = None) -> logging.Logger:
+def get_module_logger(name: str, log_file: Optional[str] = None,
+                      force_console: bool = False) -> logging.Logger:
     """
     Get a logger for a specific module with optional file output.
     
+    Console output goes to stdout when it is a terminal; otherwise only warnings
+    and errors are written, to stderr.
+    
     Args:
         name: The name of the logger (typically __name__)
         log_file: Optional path to a module-specific log file
+        force_console: Log everything to stdout even when it is not a terminal
         
     Returns:
         A configured logger instance
     """
+    return _build_module_logger(name, log_file, force_console)
+
+@functools.lru_cache(maxsize=None)
+def _build_module_logger(name: str, log_file: Optional[str],
+                         force_console: bool) -> logging.Logger:
+    """
+    Configure a module logger once per arguments; see get_module_logger.
+    
+    Args:
+        name: The name of the logger
+        log_file: Optional path to a module-specific log file
+        force_console: Log everything to stdout even when it is not a terminal
+        
+    Returns:
+        The configured logger instance
+    """
     logger = logging.getLogger(name)
     
     # If this logger already has handlers, return it
@@ -92,29 +365,38 @@ def get_module_logger(name: str, log_file: Optional[str] = None) -> logging.Logg
         return logger
         
     logger.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
-    # Add console handler if not already present
-    has_console_handler = any(isinstance(h, logging.StreamHandler) and 
-                             h.stream == sys.stdout for h in logger.handlers)
-    if not has_console_handler:
-        ch = logging.StreamHandler(sys.stdout)
-        ch.setFormatter(formatter)
-        logger.addHandler(ch)
-    
-    # Add file handler if specified
-    if log_file:
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        fh = logging.FileHandler(log_file, encoding="utf-8", mode="a")
-        fh.setFormatter(formatter)
-        logger.addHandler(fh)
     
+    # Loggers writing to the same file share one listener (and so one writer)
+    interactive = force_console or _is_tty(sys.stdout)
+    key = (os.path.abspath(log_file) if log_file else None, interactive)
+    listener = _MODULE_LISTENERS.get(key)
+    if listener is None:
+        handlers: List[logging.Handler] = []
+        
+        # Console handler
+        ch = _console_handler(sys.stdout, logging.NOTSET, force_console, _MODULE_FORMATTER)
+        if ch is not None:
+            handlers.append(ch)
+        
+        # Add file handler if specified
+        if log_file:
+            _ensure_dir(log_file)
+            fh = _BufferedFileHandler(log_file)
+            fh.setFormatter(_MODULE_FORMATTER)
+            handlers.append(_FileBuffer(fh))
+        
+        # Nothing to write to: leave the records to propagate
+        if not handlers:
+            return logger
+        
+        listener = _start_listener(*handlers)
+        _MODULE_LISTENERS[key] = listener
+    
+    # The module's own handlers cover it; don't format and write it again via root
+    logger.propagate = False
+    logger.addHandler(QueueHandler(listener.queue))
     return logger
 
-# Create module-specific loggers
-extraction_logger = get_module_logger("extraction", EXTRACTION_LOG_FILE)
-translation_logger = get_module_logger("translation", TRANSLATION_LOG_FILE)
-
 def safe_execute(func: Callable, error_msg: str, 
                 logger: Optional[logging.Logger] = None, 
                 exception_type: type = RussianAnkiError, 
@@ -141,66 +423,158 @@ def safe_execute(func: Callable, error_msg: str,
     try:
         return func(**kwargs)
     except Exception as e:
-        logger.error(f"{error_msg}: {str(e)}", exc_info=True)
-        raise exception_type(f"{error_msg}: {str(e)}") from e
+        msg = f"{error_msg}: {e}"
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("%s", msg, exc_info=True)
+        raise exception_type(msg) from e
+
+@dataclass(frozen=True)
+class CapabilityReport:
+    """Availability of each external dependency, as reported by check_dependencies."""
+    tesseract: bool
+    pdf2image: bool
+    docx: bool
+    pdfminer: bool
+    
+    @property
+    def missing(self) -> Tuple[str, ...]:
+        """
+        Names of the unavailable dependencies.
+        
+        Returns:
+            The names of all dependencies that were not found
+        """
+        return tuple(field.name for field in fields(self) if not getattr(self, field.name))
 
-def check_dependencies() -> Dict[str, bool]:
+# Result of the dependency probe, shared by all check_dependencies calls
+_DEPS_CACHE: Optional[CapabilityReport] = None
+_DEPS_LOCK = threading.Lock()
+
+def check_dependencies() -> CapabilityReport:
     """
     Check if all required external dependencies are available.
     
+    The probe runs once per process, even when called from several threads at
+    once; later calls return the cached result until invalidate_dependency_cache().
+    
     Returns:
-        A dictionary with the availability status of each dependency
+        The availability status of each dependency
+    """
+    global _DEPS_CACHE
+    if _DEPS_CACHE is None:
+        with _DEPS_LOCK:
+            if _DEPS_CACHE is None:
+                _DEPS_CACHE = _probe_dependencies()
+    return _DEPS_CACHE
+
+def invalidate_dependency_cache() -> None:
+    """Forget the cached dependency check so the next check_dependencies() probes again."""
+    global _DEPS_CACHE
+    with _DEPS_LOCK:
+        _DEPS_CACHE = None
+
+@functools.lru_cache(maxsize=1)
+def _tesseract_version(cmd: str) -> Any:
+    """
+    Get the version of a Tesseract binary; runs `tesseract --version` once per binary.
+    
+    Args:
+        cmd: Path to the Tesseract executable
+        
+    Returns:
+        The Tesseract version reported by pytesseract
     """
     import pytesseract
-    from pdf2image import convert_from_path
-    import docx
-    from pdfminer.high_level import extract_text
-    
-    # Global variables for dependency checks
-    dependencies = {
-        "tesseract": False,
-        "pdf2image": False,
-        "docx": False,
-        "pdfminer": False
-    }
-    
-    # Check Tesseract
+    pytesseract.pytesseract.tesseract_cmd = cmd
+    return pytesseract.get_tesseract_version()
+
+def _check_tesseract() -> Tuple[str, bool]:
+    """
+    Check that pytesseract is installed and the Tesseract binary runs.
+    
+    Returns:
+        The capability name and whether it is available
+    """
+    try:
+        import pytesseract
+    except ImportError:
+        logger.warning("pytesseract is not installed. OCR support will be disabled.")
+        return "tesseract", False
     try:
         if os.path.exists(TESSERACT_PATH):
-            pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH
-            pytesseract.get_tesseract_version()
-            dependencies["tesseract"] = True
-            logging.info(f"Tesseract found at: {TESSERACT_PATH}")
-        else:
-            logging.warning(f"Tesseract not found at: {TESSERACT_PATH}")
+            _tesseract_version(str(TESSERACT_PATH))
+            logger.info("Tesseract found at: %s", TESSERACT_PATH)
+            return "tesseract", True
+        logger.warning("Tesseract not found at: %s", TESSERACT_PATH)
     except Exception as e:
-        logging.warning(f"Tesseract is not properly installed: {e}")
+        logger.warning("Tesseract is not properly installed: %s", e)
+    return "tesseract", False
+
+def _check_poppler() -> Tuple[str, bool]:
+    """
+    Check that pdf2image is installed and Poppler is present.
     
-    # Check pdf2image and poppler
+    Returns:
+        The capability name and whether it is available
+    """
     try:
-        if os.path.exists(POPPLER_PATH):
-            # Test PDF conversion
-            dependencies["pdf2image"] = True
-            logging.info(f"Poppler found at: {POPPLER_PATH}")
-        else:
-            logging.warning(f"Poppler not found at: {POPPLER_PATH}")
-    except Exception as e:
-        logging.warning(f"pdf2image or poppler is not properly installed: {e}")
+        import pdf2image
+    except ImportError:
+        logger.warning("pdf2image is not installed. PDF OCR support will be disabled.")
+        return "pdf2image", False
+    if os.path.exists(POPPLER_PATH):
+        logger.info("Poppler found at: %s", POPPLER_PATH)
+        return "pdf2image", True
+    logger.warning("Poppler not found at: %s", POPPLER_PATH)
+    return "pdf2image", False
 
-    # Check python-docx
+def _check_docx() -> Tuple[str, bool]:
+    """
+    Check that lxml, which reads DOCX files, is installed.
+    
+    Returns:
+        The capability name and whether it is available
+    """
     try:
-        import docx
-        dependencies["docx"] = True
-        logging.info("python-docx is available")
+        from lxml import etree
     except ImportError:
-        logging.warning("python-docx is not installed. DOCX support will be disabled.")
+        logger.warning("lxml is not installed. DOCX support will be disabled.")
+        return "docx", False
+    logger.info("lxml is available")
+    return "docx", True
+
+def _check_pdfminer() -> Tuple[str, bool]:
+    """
+    Check that pdfminer.six is installed.
     
-    # Check pdfminer
+    Returns:
+        The capability name and whether it is available
+    """
     try:
         from pdfminer.high_level import extract_text
-        dependencies["pdfminer"] = True
-        logging.info("pdfminer.six is available")
     except ImportError:
-        logging.warning("pdfminer.six is not installed. PDF support will be disabled.")
-        
-    return dependencies
+        logger.warning("pdfminer.six is not installed. PDF support will be disabled.")
+        return "pdfminer", False
+    logger.info("pdfminer.six is available")
+    return "pdfminer", True
+
+# Independent probes run concurrently by _probe_dependencies
+_DEPENDENCY_CHECKS: Tuple[Callable[[], Tuple[str, bool]], ...] = (
+    _check_tesseract, _check_poppler, _check_docx, _check_pdfminer
+)
+
+def _probe_dependencies() -> CapabilityReport:
+    """
+    Probe the external dependencies.
+    
+    The checks are independent and mostly wait on a subprocess, file stats or
+    imports, so they run side by side rather than one after another.
+    
+    Returns:
+        The availability status of each dependency
+    """
+    # Optional packages are imported only in the checks, so that importing this module
+    # (e.g. for logging or the exceptions) does not load the OCR and PDF stacks
+    with ThreadPoolExecutor(max_workers=len(_DEPENDENCY_CHECKS)) as executor:
+        results = dict(executor.map(lambda check: check(), _DEPENDENCY_CHECKS))
+    return CapabilityReport(**results)